@@ -5,7 +5,7 @@ API endpoints for BR4, BR6 (Engagement Detection & Teacher Feedback)
 Location: backend/api/engagement_routes.py
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, current_app, g, request, jsonify, stream_with_context
 from datetime import datetime, timedelta
 from bson import ObjectId
 
@@ -39,6 +39,16 @@ from ai_engine.engagement_detection import (
 # Import logging
 from utils.logger import get_logger
 
+# Import error handling and validation helpers
+from utils.error_handlers import ValidationError
+from utils.helpers import validate_required_fields
+
+# Import shared JSON encoding
+from utils.json_provider import dumps_json, utc_isoformat
+
+# Import batched WebSocket broadcaster
+from utils.ws_batcher import get_batcher
+
 engagement_bp = Blueprint('engagement', __name__)
 
 # Initialize logger
@@ -48,6 +58,22 @@ logger = get_logger(__name__)
 logger.info("Initializing Engagement Detection Engine")
 engagement_engine = EngagementDetectionEngine()
 
+# Classes with at least this many students stream students_needing_attention
+_STREAM_CLASS_SIZE = 64
+
+# Required request body fields per endpoint
+_ANALYZE_REQUIRED = ('student_id',)
+_POLL_CREATE_REQUIRED = ('teacher_id', 'question', 'options')
+_POLL_RESPOND_REQUIRED = ('student_id', 'selected_option')
+
+
+def _require_fields(data, required_fields):
+    """Raise ValidationError if any required field is missing from the request body"""
+    is_valid, missing = validate_required_fields(data, required_fields)
+    if not is_valid:
+        raise ValidationError(f"Missing required fields: {missing}")
+
+
 # ============================================================================
 # ENGAGEMENT ROUTES (BR4, BR6)
 # ============================================================================
@@ -57,95 +83,89 @@ def analyze_engagement():
     """
     BR4: Analyze student engagement from implicit/explicit signals
     """
-    try:
-        data = request.json
-
-        student_id = data['student_id']
-        logger.info(f"Engagement analysis request | student_id: {student_id}")
-        
-        # Get recent responses from MongoDB
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_responses = find_many(
-            STUDENT_RESPONSES,
-            {
-                'student_id': student_id,
-                'submitted_at': {'$gte': week_ago}
-            },
-            sort=[('submitted_at', -1)]
-        )
-        
-        # Build implicit signals from data or use provided
-        if 'implicit_signals' in data:
-            implicit = ImplicitSignals(**data['implicit_signals'])
-        else:
-            # Calculate from actual data
-            implicit = _calculate_implicit_signals(student_id)
-        
-        # Build explicit signals from data or use provided
-        if 'explicit_signals' in data:
-            explicit = ExplicitSignals(**data['explicit_signals'])
-        else:
-            # Calculate from actual data
-            explicit = _calculate_explicit_signals(student_id)
-        
-        # Detect disengagement behaviors
-        behaviors = engagement_engine.detect_disengagement_behaviors(
-            student_id,
-            recent_responses,
-            implicit
-        )
-        
-        # Convert Enum types to strings for JSON serialization
-        for b in behaviors:
-            if hasattr(b['type'], 'value'):
-                b['type'] = b['type'].value
-        
-        # Calculate engagement score
-        logger.info(f"Calculating engagement score | student_id: {student_id}")
-        result = engagement_engine.calculate_engagement_score(
-            implicit,
-            explicit,
-            behaviors
-        )
-        logger.info(f"Engagement calculated | student_id: {student_id} | score: {result['engagement_score']} | level: {result['engagement_level']}")
+    data = request.json
+    _require_fields(data, _ANALYZE_REQUIRED)
 
-        # Save engagement session
-        session_doc = {
+    student_id = data['student_id']
+    logger.info(f"Engagement analysis request | student_id: {student_id}")
+    
+    # Get recent responses from MongoDB
+    week_ago = datetime.utcnow() - timedelta(days=7)
+    recent_responses = find_many(
+        STUDENT_RESPONSES,
+        {
+            'student_id': student_id,
+            'submitted_at': {'$gte': week_ago}
+        },
+        sort=[('submitted_at', -1)]
+    )
+    
+    # Build implicit signals from data or use provided
+    if 'implicit_signals' in data:
+        implicit = ImplicitSignals(**data['implicit_signals'])
+    else:
+        # Calculate from actual data
+        implicit = _calculate_implicit_signals(student_id)
+    
+    # Build explicit signals from data or use provided
+    if 'explicit_signals' in data:
+        explicit = ExplicitSignals(**data['explicit_signals'])
+    else:
+        # Calculate from actual data
+        explicit = _calculate_explicit_signals(student_id)
+    
+    # Detect disengagement behaviors
+    behaviors = engagement_engine.detect_disengagement_behaviors(
+        student_id,
+        recent_responses,
+        implicit
+    )
+    
+    # Convert Enum types to strings for JSON serialization
+    for b in behaviors:
+        if hasattr(b['type'], 'value'):
+            b['type'] = b['type'].value
+    
+    # Calculate engagement score
+    logger.info(f"Calculating engagement score | student_id: {student_id}")
+    result = engagement_engine.calculate_engagement_score(
+        implicit,
+        explicit,
+        behaviors
+    )
+    logger.info(f"Engagement calculated | student_id: {student_id} | score: {result['engagement_score']} | level: {result['engagement_level']}")
+
+    # Save engagement session
+    session_doc = {
+        '_id': str(ObjectId()),
+        'student_id': student_id,
+        'engagement_score': result['engagement_score'],
+        'engagement_level': result['engagement_level'],
+        'implicit_component': result['implicit_component'],
+        'explicit_component': result['explicit_component'],
+        'behaviors_detected': behaviors,
+        'recommendations': result['recommendations'],
+        'analyzed_at': datetime.utcnow()
+    }
+    
+    insert_one(ENGAGEMENT_SESSIONS, session_doc)
+    
+    # Create alerts for at-risk students
+    if result['engagement_level'] in ['AT_RISK', 'CRITICAL']:
+        alert_doc = {
             '_id': str(ObjectId()),
             'student_id': student_id,
             'engagement_score': result['engagement_score'],
             'engagement_level': result['engagement_level'],
-            'implicit_component': result['implicit_component'],
-            'explicit_component': result['explicit_component'],
-            'behaviors_detected': behaviors,
+            'severity': result['engagement_level'],
+            'behaviors': behaviors,
             'recommendations': result['recommendations'],
-            'analyzed_at': datetime.utcnow()
+            'detected_at': datetime.utcnow(),
+            'acknowledged': False
         }
-        
-        insert_one(ENGAGEMENT_SESSIONS, session_doc)
-        
-        # Create alerts for at-risk students
-        if result['engagement_level'] in ['AT_RISK', 'CRITICAL']:
-            alert_doc = {
-                '_id': str(ObjectId()),
-                'student_id': student_id,
-                'engagement_score': result['engagement_score'],
-                'engagement_level': result['engagement_level'],
-                'severity': result['engagement_level'],
-                'behaviors': behaviors,
-                'recommendations': result['recommendations'],
-                'detected_at': datetime.utcnow(),
-                'acknowledged': False
-            }
-            insert_one(DISENGAGEMENT_ALERTS, alert_doc)
-        
-        return jsonify(result), 200
-        
-    except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'detail': str(e)
-        }), 500
+        insert_one(DISENGAGEMENT_ALERTS, alert_doc)
+    
+    return jsonify(result), 200
 
 
 @engagement_bp.route('/class/<class_id>', methods=['GET'])
@@ -153,71 +173,65 @@ def get_class_engagement(class_id):
     """
     BR6: Get class-level engagement metrics for teacher dashboard
     """
-    try:
-        # Get all students in the class
-        students = find_many(STUDENTS, {'section': class_id})
-        student_ids = [s['_id'] for s in students]
-        
-        # Get latest engagement session for each student
-        student_engagements = []
-        
-        for student_id in student_ids:
-            latest_session = find_one(
-                ENGAGEMENT_SESSIONS,
-                {'student_id': student_id},
-                sort=[('analyzed_at', -1)]
-            )
-            
-            if latest_session:
-                student_engagements.append({
-                    'student_id': student_id,
-                    'engagement_score': latest_session.get('engagement_score', 0),
-                    'engagement_level': latest_session.get('engagement_level', 'MONITOR'),
-                    'recommendations': latest_session.get('recommendations', [])
-                })
-            else:
-                # Default for students without engagement data
-                student_engagements.append({
-                    'student_id': student_id,
-                    'engagement_score': 50,
-                    'engagement_level': 'MONITOR',
-                    'recommendations': ['Initial assessment needed']
-                })
-        
-        # Aggregate class metrics
-        class_metrics = engagement_engine.analyze_class_engagement(student_engagements)
-        
-        # Get students needing attention with details
-        students_needing_attention = []
-        for student_eng in class_metrics['students_needing_attention']:
-            student = find_one(STUDENTS, {'_id': student_eng['student_id']})
-            if student:
-                students_needing_attention.append({
-                    'student_id': student_eng['student_id'],
-                    'name': f"{student.get('first_name', '')} {student.get('last_name', '')}",
-                    'engagement_score': student_eng['engagement_score'],
-                    'engagement_level': student_eng['engagement_level'],
-                    'recommendations': student_eng.get('recommendations', [])
-                })
-        
-        class_data = {
-            'class_id': class_id,
-            'class_engagement_index': class_metrics['class_engagement_index'],
-            'distribution': class_metrics['distribution'],
-            'alert_count': class_metrics['alert_count'],
-            'students_needing_attention': students_needing_attention,
-            'trend': class_metrics['trend'],
-            'engagement_rate': class_metrics['engagement_rate'],
-            'class_size': class_metrics['class_size']
-        }
-        
-        return jsonify(class_data), 200
+    # Get all students in the class
+    students = find_many(STUDENTS, {'section': class_id})
+    student_ids = [s['_id'] for s in students]
+    
+    # Get latest engagement session for each student
+    student_engagements = []
+    
+    for student_id in student_ids:
+        latest_session = find_one(
+            ENGAGEMENT_SESSIONS,
+            {'student_id': student_id},
+            sort=[('analyzed_at', -1)]
+        )
         
-    except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'detail': str(e)
-        }), 500
+        if latest_session:
+            student_engagements.append({
+                'student_id': student_id,
+                'engagement_score': latest_session.get('engagement_score', 0),
+                'engagement_level': latest_session.get('engagement_level', 'MONITOR'),
+                'recommendations': latest_session.get('recommendations', [])
+            })
+        else:
+            # Default for students without engagement data
+            student_engagements.append({
+                'student_id': student_id,
+                'engagement_score': 50,
+                'engagement_level': 'MONITOR',
+                'recommendations': ['Initial assessment needed']
+            })
+    
+    # Aggregate class metrics
+    class_metrics = engagement_engine.analyze_class_engagement(student_engagements)
+    
+    class_data = {
+        'class_id': class_id,
+        'class_engagement_index': class_metrics['class_engagement_index'],
+        'distribution': class_metrics['distribution'],
+        'alert_count': class_metrics['alert_count'],
+        'trend': class_metrics['trend'],
+        'engagement_rate': class_metrics['engagement_rate'],
+        'class_size': class_metrics['class_size']
+    }
+    
+    # Large classes: stream student details as they are looked up. The class-level
+    # prefix is encoded here so encoding errors still reach the error handlers.
+    if len(student_ids) >= _STREAM_CLASS_SIZE:
+        prefix = dumps_json(class_data)[:-1] + b',"students_needing_attention":['
+        return Response(
+            stream_with_context(_stream_class_engagement(prefix, class_metrics['students_needing_attention'])),
+            mimetype='application/json'
+        )
+    
+    # Get students needing attention with details
+    class_data['students_needing_attention'] = [
+        entry for entry in map(_student_attention_entry, class_metrics['students_needing_attention'])
+        if entry
+    ]
+    
+    return jsonify(class_data), 200
 
 
 @engagement_bp.route('/student/<student_id>/history', methods=['GET'])
@@ -338,41 +352,42 @@ def create_poll():
     """
     BR4: Create anonymous live poll
     """
-    try:
-        data = request.json
-        
-        poll_doc = {
-            '_id': str(ObjectId()),
-            'teacher_id': data['teacher_id'],
-            'question': data['question'],
-            'options': data['options'],
-            'poll_type': data.get('poll_type', 'multiple_choice'),
-            'correct_answer': data.get('correct_answer'),
-            'created_at': datetime.utcnow(),
-            'closed_at': None,
-            'is_active': True
-        }
-        
-        poll_id = insert_one(LIVE_POLLS, poll_doc)
-        
-        # Broadcast poll to all students via WebSocket (would be implemented separately)
-        # socketio.emit('new_poll', poll_doc, room=class_id)
-        
-        return jsonify({
-            'poll_id': poll_id,
-            'teacher_id': data['teacher_id'],
-            'question': data['question'],
-            'options': data['options'],
-            'poll_type': poll_doc['poll_type'],
-            'created_at': poll_doc['created_at'].isoformat(),
-            'is_active': True
-        }), 201
-        
-    except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'detail': str(e)
-        }), 500
+    data = request.json
+    _require_fields(data, _POLL_CREATE_REQUIRED)
+    
+    poll_doc = {
+        '_id': str(ObjectId()),
+        'teacher_id': data['teacher_id'],
+        'class_id': data.get('class_id'),
+        'question': data['question'],
+        'options': data['options'],
+        'poll_type': data.get('poll_type', 'multiple_choice'),
+        'correct_answer': data.get('correct_answer'),
+        'created_at': g.now,
+        'closed_at': None,
+        'is_active': True
+    }
+    
+    poll_id = insert_one(LIVE_POLLS, poll_doc)
+    
+    poll_data = {
+        'poll_id': poll_id,
+        'teacher_id': data['teacher_id'],
+        'question': data['question'],
+        'options': data['options'],
+        'poll_type': poll_doc['poll_type'],
+        'created_at': poll_doc['created_at'],
+        'is_active': True
+    }
+    
+    # Notify students in the poll's class via WebSocket
+    if poll_doc['class_id']:
+        current_app.extensions['socketio'].emit('new_poll', {
+            **poll_data,
+            'created_at': utc_isoformat(poll_doc['created_at'])
+        }, to=poll_doc['class_id'])
+    
+    return jsonify(poll_data), 201
 
 
 @engagement_bp.route('/polls/<poll_id>/respond', methods=['POST'])
@@ -380,56 +395,54 @@ def respond_to_poll(poll_id):
     """
     BR4: Submit anonymous poll response
     """
-    try:
-        data = request.json
-        
-        # Check if poll exists and is active
-        poll = find_one(LIVE_POLLS, {'_id': poll_id})
-        
-        if not poll:
-            return jsonify({'error': 'Poll not found'}), 404
-        
-        if not poll.get('is_active'):
-            return jsonify({'error': 'Poll is no longer active'}), 400
-        
-        # Check if student already responded
-        existing_response = find_one(
-            POLL_RESPONSES,
-            {
-                'poll_id': poll_id,
-                'student_id': data['student_id']
-            }
-        )
-        
-        if existing_response:
-            return jsonify({'error': 'Already responded to this poll'}), 400
-        
-        # Create response
-        response_doc = {
-            '_id': str(ObjectId()),
+    data = request.json
+    _require_fields(data, _POLL_RESPOND_REQUIRED)
+    
+    # Check if poll exists and is active
+    poll = find_one(LIVE_POLLS, {'_id': poll_id})
+    
+    if not poll:
+        return jsonify({'error': 'Poll not found'}), 404
+    
+    if not poll.get('is_active'):
+        return jsonify({'error': 'Poll is no longer active'}), 400
+    
+    # Check if student already responded
+    existing_response = find_one(
+        POLL_RESPONSES,
+        {
             'poll_id': poll_id,
-            'student_id': data['student_id'],
-            'selected_option': data['selected_option'],
-            'response_time': data.get('response_time'),
-            'submitted_at': datetime.utcnow()
+            'student_id': data['student_id']
         }
-        
-        response_id = insert_one(POLL_RESPONSES, response_doc)
-        
-        # Update poll results in real-time via WebSocket
-        # socketio.emit('poll_update', {poll_id, response_count}, room=poll.teacher_id)
-        
-        return jsonify({
-            'response_id': response_id,
+    )
+    
+    if existing_response:
+        return jsonify({'error': 'Already responded to this poll'}), 400
+    
+    # Create response
+    response_doc = {
+        '_id': str(ObjectId()),
+        'poll_id': poll_id,
+        'student_id': data['student_id'],
+        'selected_option': data['selected_option'],
+        'response_time': data.get('response_time'),
+        'submitted_at': g.now
+    }
+    
+    response_id = insert_one(POLL_RESPONSES, response_doc)
+    
+    # Queue real-time update for the class's teachers; flushed as a batched 'poll_response_batch' event
+    if poll.get('class_id'):
+        get_batcher().enqueue('poll_response', {
             'poll_id': poll_id,
-            'message': 'Response recorded successfully'
-        }), 201
-        
-    except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'detail': str(e)
-        }), 500
+            'selected_option': data['selected_option']
+        }, room=f"teachers_{poll['class_id']}")
+    
+    return jsonify({
+        'response_id': response_id,
+        'poll_id': poll_id,
+        'message': 'Response recorded successfully'
+    }), 201
 
 
 @engagement_bp.route('/polls/<poll_id>', methods=['GET'])
@@ -437,62 +450,55 @@ def get_poll_results(poll_id):
     """
     BR6: Get aggregated poll results for teacher
     """
-    try:
-        poll = find_one(LIVE_POLLS, {'_id': poll_id})
-        
-        if not poll:
-            return jsonify({'error': 'Poll not found'}), 404
-        
-        # Aggregate responses
-        pipeline = [
-            {'$match': {'poll_id': poll_id}},
-            {
-                '$group': {
-                    '_id': '$selected_option',
-                    'count': {'$sum': 1}
-                }
+    poll = find_one(LIVE_POLLS, {'_id': poll_id})
+    
+    if not poll:
+        return jsonify({'error': 'Poll not found'}), 404
+    
+    # Aggregate responses
+    pipeline = [
+        {'$match': {'poll_id': poll_id}},
+        {
+            '$group': {
+                '_id': '$selected_option',
+                'count': {'$sum': 1}
             }
-        ]
-        
-        aggregated_responses = aggregate(POLL_RESPONSES, pipeline)
-        
-        # Format responses
-        total_responses = sum(r['count'] for r in aggregated_responses)
-        
-        formatted_responses = []
-        for option in poll['options']:
-            count = next((r['count'] for r in aggregated_responses if r['_id'] == option), 0)
-            percentage = (count / total_responses * 100) if total_responses > 0 else 0
-            
-            formatted_responses.append({
-                'option': option,
-                'count': count,
-                'percentage': round(percentage, 1)
-            })
-        
-        # Get class size (would need class_id from poll)
-        class_size = total_responses  # Placeholder
-        participation_rate = (total_responses / class_size * 100) if class_size > 0 else 0
-        
-        results = {
-            'poll_id': poll_id,
-            'question': poll.get('question'),
-            'poll_type': poll.get('poll_type'),
-            'responses': formatted_responses,
-            'total_responses': total_responses,
-            'class_size': class_size,
-            'participation_rate': round(participation_rate, 1),
-            'is_active': poll.get('is_active'),
-            'created_at': poll.get('created_at').isoformat() if poll.get('created_at') else None
         }
-        
-        return jsonify(results), 200
-        
-    except Exception as e:
-        return jsonify({
-            'error': 'Internal server error',
-            'detail': str(e)
-        }), 500
+    ]
+    
+    aggregated_responses = aggregate(POLL_RESPONSES, pipeline)
+    
+    # Format responses
+    total_responses = sum(r['count'] for r in aggregated_responses)
+    
+    formatted_responses = []
+    for option in poll['options']:
+        count = next((r['count'] for r in aggregated_responses if r['_id'] == option), 0)
+        percentage = (count / total_responses * 100) if total_responses > 0 else 0
+        
+        formatted_responses.append({
+            'option': option,
+            'count': count,
+            'percentage': round(percentage, 1)
+        })
+    
+    # Get class size (would need class_id from poll)
+    class_size = total_responses  # Placeholder
+    participation_rate = (total_responses / class_size * 100) if class_size > 0 else 0
+    
+    results = {
+        'poll_id': poll_id,
+        'question': poll.get('question'),
+        'poll_type': poll.get('poll_type'),
+        'responses': formatted_responses,
+        'total_responses': total_responses,
+        'class_size': class_size,
+        'participation_rate': round(participation_rate, 1),
+        'is_active': poll.get('is_active'),
+        'created_at': poll.get('created_at')
+    }
+    
+    return jsonify(results), 200
 
 
 
@@ -713,6 +719,42 @@ def report_violation():
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _student_attention_entry(student_eng):
+    """Build the students_needing_attention entry for a student, or None if the student is missing"""
+    student = find_one(STUDENTS, {'_id': student_eng['student_id']})
+    if not student:
+        return None
+    
+    return {
+        'student_id': student_eng['student_id'],
+        'name': f"{student.get('first_name', '')} {student.get('last_name', '')}",
+        'engagement_score': student_eng['engagement_score'],
+        'engagement_level': student_eng['engagement_level'],
+        'recommendations': student_eng.get('recommendations', [])
+    }
+
+
+def _stream_class_engagement(prefix, students_needing_attention):
+    """
+    Yield the class engagement JSON in chunks, one student entry at a time
+    
+    prefix is the pre-encoded class-level object, open at the
+    students_needing_attention array, so each entry can be sent as soon as
+    it is built.
+    """
+    yield prefix
+    
+    first = True
+    for student_eng in students_needing_attention:
+        entry = _student_attention_entry(student_eng)
+        if not entry:
+            continue
+        yield dumps_json(entry) if first else b',' + dumps_json(entry)
+        first = False
+    
+    yield b']}'
+
+
 def _calculate_implicit_signals(student_id):
     """Calculate implicit signals from student activity data"""
     week_ago = datetime.utcnow() - timedelta(days=7)
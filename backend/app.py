@@ -8,7 +8,7 @@ Location: backend/app.py
 # Graceful degradation - Library now installed
 # import sklearn  # Temporarily commented out for testing
 
-from flask import Flask, jsonify
+from flask import Flask, g, jsonify
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit
 from datetime import datetime
@@ -20,6 +20,12 @@ from config import Config
 # Import logging
 from utils.logger import get_logger, log_request_middleware
 
+# Import JSON provider
+from utils.json_provider import AMEPJSONProvider
+
+# Import batched WebSocket broadcaster
+from utils.ws_batcher import SocketIOBatcher
+
 # Import database
 from models.database import init_db
 
@@ -39,6 +45,9 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # Serialize JSON responses through orjson instead of the stdlib encoder
+    app.json = AMEPJSONProvider(app)
+
     logger.info(f"Environment: {app.config['ENV']}")
     logger.info(f"Debug Mode: {app.config['DEBUG']}")
 
@@ -56,6 +65,7 @@ def create_app(config_class=Config):
 
     # Make socketio accessible in blueprints
     app.extensions["socketio"] = socketio
+    app.extensions["ws_batcher"] = SocketIOBatcher(socketio)
 
     # Initialize database
     logger.info("Initializing database connection...")
@@ -66,6 +76,9 @@ def create_app(config_class=Config):
     log_request_middleware(app)
     logger.info("Request logging middleware enabled")
 
+    # Stamp each request with a single UTC timestamp
+    register_request_hooks(app)
+
     # Register blueprints
     register_blueprints(app)
 
@@ -82,6 +95,19 @@ def create_app(config_class=Config):
     return app, socketio
 
 
+# ============================================================================
+# REQUEST HOOKS
+# ============================================================================
+
+def register_request_hooks(app):
+    """Register per-request hooks shared by all blueprints"""
+
+    @app.before_request
+    def stamp_request_time():
+        # Computed once so every timestamp written during the request agrees
+        g.now = datetime.utcnow()
+
+
 # ============================================================================
 # BLUEPRINT REGISTRATION
 # ============================================================================
@@ -191,6 +217,9 @@ def register_socketio_events(socketio):
         role = data.get("role", "student")
 
         join_room(class_id)
+        if role == "teacher":
+            # Teacher-only events (engagement alerts, poll responses) target this room
+            join_room(f"teachers_{class_id}")
         logger.info(f"WebSocket: User {user_id} ({role}) joined class {class_id}")
 
         emit(
@@ -212,6 +241,7 @@ def register_socketio_events(socketio):
         user_id = data.get("user_id")
 
         leave_room(class_id)
+        leave_room(f"teachers_{class_id}")
         logger.info(f"WebSocket: User {user_id} left class {class_id}")
 
     @socketio.on("poll_response_submitted")
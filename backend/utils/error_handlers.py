@@ -5,8 +5,9 @@ Centralized error handling for Flask application
 Location: backend/utils/error_handlers.py
 """
 
-from flask import jsonify
+from flask import Response, jsonify
 from werkzeug.exceptions import HTTPException
+import orjson
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,59 @@ logger = logging.getLogger(__name__)
 # ERROR HANDLER REGISTRATION
 # ============================================================================
 
+# Status code -> (error name, message, log level, log prefix, echo error).
+# When echo error is set, the message is str(error) if the error carries a
+# description, falling back to the listed message.
+_HTTP_ERRORS = {
+    400: ('Bad Request', 'Invalid request format', 'warning', 'Bad Request', True),
+    401: ('Unauthorized', 'Authentication required. Please provide valid credentials.', 'warning', 'Unauthorized access attempt', False),
+    403: ('Forbidden', 'You do not have permission to access this resource.', 'warning', 'Forbidden access attempt', False),
+    404: ('Not Found', 'The requested resource could not be found.', 'info', 'Resource not found', False),
+    405: ('Method Not Allowed', 'The HTTP method is not allowed for this endpoint.', 'warning', 'Method not allowed', False),
+    409: ('Conflict', 'Resource conflict occurred', 'warning', 'Conflict', True),
+    422: ('Unprocessable Entity', 'The request was well-formed but contains semantic errors.', 'warning', 'Unprocessable entity', False),
+    429: ('Too Many Requests', 'Rate limit exceeded. Please try again later.', 'warning', 'Rate limit exceeded', False),
+    500: ('Internal Server Error', 'An unexpected error occurred. Please try again later.', 'error', 'Internal server error', False),
+    502: ('Bad Gateway', 'Invalid response from upstream server.', 'error', 'Bad gateway', False),
+    503: ('Service Unavailable', 'Service temporarily unavailable. Please try again later.', 'error', 'Service unavailable', False),
+    504: ('Gateway Timeout', 'Request timeout. Please try again.', 'error', 'Gateway timeout', False),
+}
+
+# Pre-serialized response bodies for the fixed messages above
+_HTTP_ERROR_BODIES = {
+    code: orjson.dumps({
+        'success': False,
+        'error': name,
+        'message': message,
+        'status_code': code
+    })
+    for code, (name, message, _, _, _) in _HTTP_ERRORS.items()
+}
+
+
+def _make_http_error_handler(code, name, log_level, log_prefix, echo_error):
+    """Build the error handler for a single HTTP status code"""
+    log = getattr(logger, log_level)
+    exc_info = code == 500
+    body = _HTTP_ERROR_BODIES[code]
+
+    def handle_http_error(error):
+        log(f"{log_prefix}: {error}", exc_info=exc_info)
+
+        if echo_error and hasattr(error, 'description'):
+            return jsonify({
+                'success': False,
+                'error': name,
+                'message': str(error),
+                'status_code': code
+            }), code
+
+        return Response(body, status=code, mimetype='application/json')
+
+    handle_http_error.__name__ = f'handle_{code}'
+    return handle_http_error
+
+
 def register_error_handlers(app):
     """
     Register all error handlers with Flask app
@@ -23,137 +77,11 @@ def register_error_handlers(app):
         app: Flask application instance
     """
 
-    @app.errorhandler(400)
-    def bad_request(error):
-        """Handle 400 Bad Request errors"""
-        logger.warning(f"Bad Request: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Bad Request',
-            'message': str(error) if hasattr(error, 'description') else 'Invalid request format',
-            'status_code': 400
-        }), 400
-
-    @app.errorhandler(401)
-    def unauthorized(error):
-        """Handle 401 Unauthorized errors"""
-        logger.warning(f"Unauthorized access attempt: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Unauthorized',
-            'message': 'Authentication required. Please provide valid credentials.',
-            'status_code': 401
-        }), 401
-
-    @app.errorhandler(403)
-    def forbidden(error):
-        """Handle 403 Forbidden errors"""
-        logger.warning(f"Forbidden access attempt: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Forbidden',
-            'message': 'You do not have permission to access this resource.',
-            'status_code': 403
-        }), 403
-
-    @app.errorhandler(404)
-    def not_found(error):
-        """Handle 404 Not Found errors"""
-        logger.info(f"Resource not found: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Not Found',
-            'message': 'The requested resource could not be found.',
-            'status_code': 404
-        }), 404
-
-    @app.errorhandler(405)
-    def method_not_allowed(error):
-        """Handle 405 Method Not Allowed errors"""
-        logger.warning(f"Method not allowed: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Method Not Allowed',
-            'message': 'The HTTP method is not allowed for this endpoint.',
-            'status_code': 405
-        }), 405
-
-    @app.errorhandler(409)
-    def conflict(error):
-        """Handle 409 Conflict errors"""
-        logger.warning(f"Conflict: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Conflict',
-            'message': str(error) if hasattr(error, 'description') else 'Resource conflict occurred',
-            'status_code': 409
-        }), 409
-
-    @app.errorhandler(422)
-    def unprocessable_entity(error):
-        """Handle 422 Unprocessable Entity errors"""
-        logger.warning(f"Unprocessable entity: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Unprocessable Entity',
-            'message': 'The request was well-formed but contains semantic errors.',
-            'status_code': 422
-        }), 422
-
-    @app.errorhandler(429)
-    def too_many_requests(error):
-        """Handle 429 Too Many Requests errors"""
-        logger.warning(f"Rate limit exceeded: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Too Many Requests',
-            'message': 'Rate limit exceeded. Please try again later.',
-            'status_code': 429
-        }), 429
-
-    @app.errorhandler(500)
-    def internal_server_error(error):
-        """Handle 500 Internal Server Error"""
-        logger.error(f"Internal server error: {error}", exc_info=True)
-        return jsonify({
-            'success': False,
-            'error': 'Internal Server Error',
-            'message': 'An unexpected error occurred. Please try again later.',
-            'status_code': 500
-        }), 500
-
-    @app.errorhandler(502)
-    def bad_gateway(error):
-        """Handle 502 Bad Gateway errors"""
-        logger.error(f"Bad gateway: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Bad Gateway',
-            'message': 'Invalid response from upstream server.',
-            'status_code': 502
-        }), 502
-
-    @app.errorhandler(503)
-    def service_unavailable(error):
-        """Handle 503 Service Unavailable errors"""
-        logger.error(f"Service unavailable: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Service Unavailable',
-            'message': 'Service temporarily unavailable. Please try again later.',
-            'status_code': 503
-        }), 503
-
-    @app.errorhandler(504)
-    def gateway_timeout(error):
-        """Handle 504 Gateway Timeout errors"""
-        logger.error(f"Gateway timeout: {error}")
-        return jsonify({
-            'success': False,
-            'error': 'Gateway Timeout',
-            'message': 'Request timeout. Please try again.',
-            'status_code': 504
-        }), 504
+    for code, (name, _, log_level, log_prefix, echo_error) in _HTTP_ERRORS.items():
+        app.register_error_handler(
+            code,
+            _make_http_error_handler(code, name, log_level, log_prefix, echo_error)
+        )
 
     @app.errorhandler(HTTPException)
     def handle_http_exception(error):
@@ -191,6 +119,8 @@ def register_error_handlers(app):
 
 class AMEPException(Exception):
     """Base exception for AMEP application"""
+    __slots__ = ('message', 'status_code', 'payload')
+
     def __init__(self, message, status_code=400, payload=None):
         super().__init__()
         self.message = message
@@ -198,52 +128,67 @@ class AMEPException(Exception):
         self.payload = payload
 
     def to_dict(self):
-        rv = dict(self.payload or ())
-        rv['success'] = False
-        rv['error'] = self.__class__.__name__
-        rv['message'] = self.message
-        rv['status_code'] = self.status_code
-        return rv
+        return {
+            **(self.payload or {}),
+            'success': False,
+            'error': type(self).__name__,
+            'message': self.message,
+            'status_code': self.status_code
+        }
 
 
 class ValidationError(AMEPException):
     """Validation error exception"""
+    __slots__ = ()
+
     def __init__(self, message, payload=None):
         super().__init__(message, status_code=400, payload=payload)
 
 
 class AuthenticationError(AMEPException):
     """Authentication error exception"""
+    __slots__ = ()
+
     def __init__(self, message='Authentication required', payload=None):
         super().__init__(message, status_code=401, payload=payload)
 
 
 class AuthorizationError(AMEPException):
     """Authorization error exception"""
+    __slots__ = ()
+
     def __init__(self, message='Insufficient permissions', payload=None):
         super().__init__(message, status_code=403, payload=payload)
 
 
 class ResourceNotFoundError(AMEPException):
     """Resource not found exception"""
+    __slots__ = ()
+
     def __init__(self, message='Resource not found', payload=None):
         super().__init__(message, status_code=404, payload=payload)
 
 
 class ResourceConflictError(AMEPException):
     """Resource conflict exception"""
+    __slots__ = ()
+
     def __init__(self, message='Resource conflict', payload=None):
         super().__init__(message, status_code=409, payload=payload)
 
 
 class DatabaseError(AMEPException):
     """Database error exception"""
+    __slots__ = ()
+
     def __init__(self, message='Database operation failed', payload=None):
         super().__init__(message, status_code=500, payload=payload)
 
 
 class ExternalServiceError(AMEPException):
     """External service error exception"""
+    __slots__ = ()
+
     def __init__(self, message='External service error', payload=None):
         super().__init__(message, status_code=502, payload=payload)
 
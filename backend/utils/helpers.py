@@ -5,14 +5,35 @@ Common utility functions used across the application
 Location: backend/utils/helpers.py
 """
 
-from flask import jsonify
+from flask import Response, g, has_app_context
 from datetime import datetime, timedelta
 from bson import ObjectId
+from itertools import islice
+import numpy as np
+import bisect
 import re
+import time
 import logging
 
+from utils.json_provider import dumps_json
+
 logger = logging.getLogger(__name__)
 
+# Precompiled patterns used by the validation and string helpers
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_PW_LETTER_RE = re.compile(r'[a-zA-Z]')
+_SLUG_SPACE_RE = re.compile(r'[\s_]+')
+_SLUG_STRIP_RE = re.compile(r'[^\w\-]')
+_SLUG_DASH_RE = re.compile(r'\-+')
+
+# ASCII slug table: whitespace/underscore -> hyphen, other non-[a-z0-9-] dropped
+_SLUG_KEEP = set('abcdefghijklmnopqrstuvwxyz0123456789-')
+_SLUG_TABLE = str.maketrans({
+    c: '-' if c.isspace() or c == '_' else None
+    for c in map(chr, range(128))
+    if c not in _SLUG_KEEP
+})
+
 # ============================================================================
 # VALIDATION HELPERS
 # ============================================================================
@@ -27,8 +48,7 @@ def validate_email(email):
     Returns:
         bool: True if valid email format
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 def validate_password(password):
@@ -49,7 +69,7 @@ def validate_password(password):
     if len(password) < 6:
         return False, "Password must be at least 6 characters"
 
-    if not re.search(r'[a-zA-Z]', password):
+    if not _PW_LETTER_RE.search(password):
         return False, "Password must contain at least one letter"
 
     return True, None
@@ -65,14 +85,7 @@ def validate_object_id(object_id):
     Returns:
         bool: True if valid ObjectId format
     """
-    if not object_id:
-        return False
-
-    try:
-        ObjectId(object_id)
-        return True
-    except:
-        return False
+    return bool(object_id) and ObjectId.is_valid(object_id)
 
 
 def validate_required_fields(data, required_fields):
@@ -80,23 +93,39 @@ def validate_required_fields(data, required_fields):
     Validate that all required fields are present in request data
 
     Args:
-        data (dict): Request data
-        required_fields (list): List of required field names
+        data (dict): Request data; any non-dict body reports every field missing
+        required_fields (list|tuple): Required field names
 
     Returns:
         tuple: (is_valid, missing_fields)
     """
-    if not data:
-        return False, required_fields
+    if not data or not isinstance(data, dict):
+        return False, list(required_fields)
 
-    missing = [field for field in required_fields if field not in data or data[field] is None]
-    return len(missing) == 0, missing
+    # Fast path: a single C-level pass over data.get for the common all-present case
+    if None not in map(data.get, required_fields):
+        return True, []
+
+    missing = [field for field in required_fields if data.get(field) is None]
+    return False, missing
 
 
 # ============================================================================
 # RESPONSE HELPERS
 # ============================================================================
 
+def _request_time():
+    """Return the request's cached UTC time, or the current time outside a request"""
+    if has_app_context() and g.get('now'):
+        return g.now
+    return datetime.utcnow()
+
+
+def _json_response(payload):
+    """Encode payload into a JSON Response with the app's orjson configuration"""
+    return Response(dumps_json(payload), mimetype='application/json')
+
+
 def success_response(message=None, data=None, status_code=200):
     """
     Create standardized success response
@@ -118,9 +147,9 @@ def success_response(message=None, data=None, status_code=200):
         response['data'] = data
 
     response['success'] = True
-    response['timestamp'] = datetime.utcnow().isoformat()
+    response['timestamp'] = _request_time()
 
-    return jsonify(response), status_code
+    return _json_response(response), status_code
 
 
 def error_response(error=None, detail=None, status_code=400):
@@ -137,7 +166,7 @@ def error_response(error=None, detail=None, status_code=400):
     """
     response = {
         'success': False,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': _request_time()
     }
 
     if error:
@@ -146,13 +175,17 @@ def error_response(error=None, detail=None, status_code=400):
     if detail:
         response['detail'] = detail
 
-    return jsonify(response), status_code
+    return _json_response(response), status_code
 
 
 # ============================================================================
 # DATE/TIME HELPERS
 # ============================================================================
 
+# Shared timedelta objects for the common analytics windows
+_TIMEDELTA_CACHE = {days: timedelta(days=days) for days in (1, 7, 14, 30, 90)}
+
+
 def get_date_range(days_ago=7):
     """
     Get date range from X days ago to now
@@ -164,8 +197,22 @@ def get_date_range(days_ago=7):
         tuple: (start_date, end_date)
     """
     end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days_ago)
-    return start_date, end_date
+    delta = _TIMEDELTA_CACHE.get(days_ago) or timedelta(days=days_ago)
+    return end_date - delta, end_date
+
+
+def get_date_range_ts(days_ago=7):
+    """
+    Get date range from X days ago to now as Unix timestamps
+
+    Args:
+        days_ago (int): Number of days in the past
+
+    Returns:
+        tuple: (start_ts, end_ts) in seconds since the epoch
+    """
+    end_ts = time.time()
+    return end_ts - days_ago * 86400.0, end_ts
 
 
 def format_datetime(dt):
@@ -209,9 +256,18 @@ def parse_datetime(dt_string):
         return None
 
 
+# Per-day caches: [day ordinal, value]. Racy writes are harmless since they are idempotent.
+_WEEK_NUMBER_CACHE = [None, None]
+_ACADEMIC_YEAR_CACHE = [None, None]
+
+
 def get_week_number():
     """Get current ISO week number"""
-    return datetime.utcnow().isocalendar()[1]
+    now = datetime.utcnow()
+    day = now.toordinal()
+    if _WEEK_NUMBER_CACHE[0] != day:
+        _WEEK_NUMBER_CACHE[:] = [day, now.isocalendar()[1]]
+    return _WEEK_NUMBER_CACHE[1]
 
 
 def get_academic_year():
@@ -220,21 +276,77 @@ def get_academic_year():
     Academic year starts in September
     """
     now = datetime.utcnow()
-    if now.month >= 9:
-        return f"{now.year}-{now.year + 1}"
-    else:
-        return f"{now.year - 1}-{now.year}"
+    day = now.toordinal()
+    if _ACADEMIC_YEAR_CACHE[0] != day:
+        if now.month >= 9:
+            academic_year = f"{now.year}-{now.year + 1}"
+        else:
+            academic_year = f"{now.year - 1}-{now.year}"
+        _ACADEMIC_YEAR_CACHE[:] = [day, academic_year]
+    return _ACADEMIC_YEAR_CACHE[1]
 
 
 # ============================================================================
 # DATA TRANSFORMATION HELPERS
 # ============================================================================
 
+# Per-type converters for values that need to change for JSON output
+_SANITIZE_CONVERTERS = {
+    ObjectId: str,
+    datetime: datetime.isoformat,
+}
+
+# Types that are copied through unchanged
+_SANITIZE_PASSTHROUGH = frozenset({str, int, float, bool, type(None)})
+
+
+def _sanitize_child(value, stack):
+    """
+    Create the output container for a nested dict and queue it for processing
+
+    Empty dicts map to None, matching sanitize_mongo_doc's handling of falsy docs.
+    """
+    if not value:
+        return None
+    out = {}
+    stack.append((value, out))
+    return out
+
+
+def _drain_sanitize_stack(stack):
+    """Process queued (source, destination) dict pairs until none remain"""
+    while stack:
+        src, dst = stack.pop()
+        for key, value in src.items():
+            value_type = type(value)
+
+            if value_type in _SANITIZE_PASSTHROUGH:
+                dst[key] = value
+                continue
+
+            converter = _SANITIZE_CONVERTERS.get(value_type)
+            if converter is not None:
+                dst[key] = converter(value)
+            elif value_type is dict or isinstance(value, dict):
+                dst[key] = _sanitize_child(value, stack)
+            elif value_type is list or isinstance(value, list):
+                dst[key] = [_sanitize_child(item, stack) if isinstance(item, dict) else item for item in value]
+            # Subclasses of ObjectId/datetime miss the exact-type table
+            elif isinstance(value, ObjectId):
+                dst[key] = str(value)
+            elif isinstance(value, datetime):
+                dst[key] = value.isoformat()
+            else:
+                dst[key] = value
+
+
 def sanitize_mongo_doc(doc):
     """
     Sanitize MongoDB document for JSON response
     Converts ObjectId to string, formats dates
 
+    Walks nested documents with an explicit stack rather than recursion.
+
     Args:
         doc (dict): MongoDB document
 
@@ -244,21 +356,9 @@ def sanitize_mongo_doc(doc):
     if not doc:
         return None
 
-    # Make a copy to avoid modifying original
-    sanitized = {}
-
-    for key, value in doc.items():
-        if isinstance(value, ObjectId):
-            sanitized[key] = str(value)
-        elif isinstance(value, datetime):
-            sanitized[key] = value.isoformat()
-        elif isinstance(value, dict):
-            sanitized[key] = sanitize_mongo_doc(value)
-        elif isinstance(value, list):
-            sanitized[key] = [sanitize_mongo_doc(item) if isinstance(item, dict) else item for item in value]
-        else:
-            sanitized[key] = value
-
+    stack = []
+    sanitized = _sanitize_child(doc, stack)
+    _drain_sanitize_stack(stack)
     return sanitized
 
 
@@ -266,13 +366,18 @@ def sanitize_mongo_docs(docs):
     """
     Sanitize list of MongoDB documents
 
+    All documents share one work stack, so the batch is processed in a single pass.
+
     Args:
         docs (list): List of MongoDB documents
 
     Returns:
         list: List of sanitized documents
     """
-    return [sanitize_mongo_doc(doc) for doc in docs]
+    stack = []
+    sanitized = [_sanitize_child(doc, stack) for doc in docs]
+    _drain_sanitize_stack(stack)
+    return sanitized
 
 
 def calculate_percentage(numerator, denominator, decimal_places=1):
@@ -310,6 +415,46 @@ def calculate_average(values):
     return sum(values) / len(values)
 
 
+def calculate_percentages(numerators, denominators, decimal_places=1):
+    """
+    Vectorized calculate_percentage over arrays of numerators/denominators
+
+    Args:
+        numerators (array-like): Numerators
+        denominators (array-like): Denominators (broadcastable to numerators)
+        decimal_places (int): Number of decimal places
+
+    Returns:
+        np.ndarray: Percentages, 0.0 wherever the denominator is 0
+    """
+    numerators = np.asarray(numerators, dtype=np.float64)
+    denominators = np.asarray(denominators, dtype=np.float64)
+
+    ratios = np.zeros(np.broadcast(numerators, denominators).shape)
+    np.divide(numerators, denominators, out=ratios, where=denominators != 0)
+    return np.round(ratios * 100, decimal_places)
+
+
+def calculate_averages(values_2d):
+    """
+    Vectorized calculate_average over the rows of a 2D array
+
+    Ragged rows can be padded with NaN; padding is excluded from each row's mean.
+
+    Args:
+        values_2d (array-like): 2D array of numbers, one row per series
+
+    Returns:
+        np.ndarray: Average per row, 0.0 for rows with no values
+    """
+    values = np.asarray(values_2d, dtype=np.float64)
+    present = ~np.isnan(values)
+
+    totals = np.where(present, values, 0.0).sum(axis=-1)
+    counts = present.sum(axis=-1)
+    return np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)
+
+
 def clamp(value, min_value, max_value):
     """
     Clamp value between min and max
@@ -348,6 +493,14 @@ def normalize_score(score, min_val=0, max_val=100):
     return clamp(normalized, 0.0, 100.0)
 
 
+# Level thresholds: a score below _TH[i] maps to _LEVELS[i], at or above the last maps to _LEVELS[-1]
+_MASTERY_THRESHOLDS = (20, 50, 70, 90)
+_MASTERY_LEVELS = ("NOT_STARTED", "DEVELOPING", "APPROACHING", "PROFICIENT", "MASTERED")
+
+_ENGAGEMENT_THRESHOLDS = (30, 50, 60, 75)
+_ENGAGEMENT_LEVELS = ("CRITICAL", "AT_RISK", "MONITOR", "PASSIVE", "ENGAGED")
+
+
 def categorize_mastery_level(mastery_score):
     """
     Categorize mastery score into level
@@ -358,16 +511,7 @@ def categorize_mastery_level(mastery_score):
     Returns:
         str: Mastery level (NOT_STARTED, DEVELOPING, APPROACHING, PROFICIENT, MASTERED)
     """
-    if mastery_score < 20:
-        return "NOT_STARTED"
-    elif mastery_score < 50:
-        return "DEVELOPING"
-    elif mastery_score < 70:
-        return "APPROACHING"
-    elif mastery_score < 90:
-        return "PROFICIENT"
-    else:
-        return "MASTERED"
+    return _MASTERY_LEVELS[bisect.bisect_right(_MASTERY_THRESHOLDS, mastery_score)]
 
 
 def categorize_engagement_level(engagement_score):
@@ -380,16 +524,7 @@ def categorize_engagement_level(engagement_score):
     Returns:
         str: Engagement level (CRITICAL, AT_RISK, MONITOR, PASSIVE, ENGAGED)
     """
-    if engagement_score < 30:
-        return "CRITICAL"
-    elif engagement_score < 50:
-        return "AT_RISK"
-    elif engagement_score < 60:
-        return "MONITOR"
-    elif engagement_score < 75:
-        return "PASSIVE"
-    else:
-        return "ENGAGED"
+    return _ENGAGEMENT_LEVELS[bisect.bisect_right(_ENGAGEMENT_THRESHOLDS, engagement_score)]
 
 
 # ============================================================================
@@ -421,26 +556,50 @@ def log_warning(message, context=None):
 # PAGINATION HELPERS
 # ============================================================================
 
-def paginate(items, page=1, per_page=20):
+def paginate(items, page=1, per_page=20, total_items=None):
     """
     Paginate list of items
 
+    Accepts a list, any iterable, or a pymongo cursor. Cursors are paginated
+    in MongoDB via skip/limit so only the requested page is fetched.
+
     Args:
-        items (list): List to paginate
-        page (int): Page number (1-indexed)
+        items (list|iterable|Cursor): Items to paginate
+        page (int): Page number (1-indexed, values below 1 are treated as 1)
         per_page (int): Items per page
+        total_items (int): Total matching items; required for cursors
+            (e.g. count_documents(query)), computed otherwise
 
     Returns:
         dict: Paginated result with metadata
-    """
-    total_items = len(items)
-    total_pages = (total_items + per_page - 1) // per_page  # Ceiling division
 
+    Raises:
+        ValueError: If items is a cursor and total_items is not given
+    """
+    page = max(page, 1)
     start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
+
+    if hasattr(items, 'skip'):
+        # pymongo cursor: push pagination down to the database
+        if total_items is None:
+            raise ValueError("total_items is required when paginating a cursor")
+        page_items = list(items.skip(start_idx).limit(per_page))
+    elif hasattr(items, '__len__') and hasattr(items, '__getitem__'):
+        page_items = items[start_idx:start_idx + per_page]
+        if total_items is None:
+            total_items = len(items)
+    else:
+        # Generic iterable: keep only the requested page in memory
+        iterator = iter(items)
+        skipped = sum(1 for _ in islice(iterator, start_idx))
+        page_items = list(islice(iterator, per_page))
+        if total_items is None:
+            total_items = skipped + len(page_items) + sum(1 for _ in iterator)
+
+    total_pages = (total_items + per_page - 1) // per_page  # Ceiling division
 
     return {
-        'items': items[start_idx:end_idx],
+        'items': page_items,
         'pagination': {
             'page': page,
             'per_page': per_page,
@@ -469,14 +628,16 @@ def slugify(text):
     # Convert to lowercase
     text = text.lower()
 
-    # Replace spaces and underscores with hyphens
-    text = re.sub(r'[\s_]+', '-', text)
-
-    # Remove special characters
-    text = re.sub(r'[^\w\-]', '', text)
+    if text.isascii():
+        # Replace spaces/underscores and remove special characters in one pass
+        text = text.translate(_SLUG_TABLE)
+    else:
+        # Non-ASCII input keeps Unicode word characters
+        text = _SLUG_SPACE_RE.sub('-', text)
+        text = _SLUG_STRIP_RE.sub('', text)
 
     # Remove multiple consecutive hyphens
-    text = re.sub(r'\-+', '-', text)
+    text = _SLUG_DASH_RE.sub('-', text)
 
     # Strip hyphens from start and end
     text = text.strip('-')
@@ -519,6 +680,7 @@ __all__ = [
 
     # Date/Time
     'get_date_range',
+    'get_date_range_ts',
     'format_datetime',
     'parse_datetime',
     'get_week_number',
@@ -529,6 +691,8 @@ __all__ = [
     'sanitize_mongo_docs',
     'calculate_percentage',
     'calculate_average',
+    'calculate_percentages',
+    'calculate_averages',
     'clamp',
 
     # Scoring
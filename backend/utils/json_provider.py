@@ -0,0 +1,59 @@
+"""
+AMEP JSON Encoding
+Shared orjson configuration for the Flask JSON provider and direct encoders
+
+Location: backend/utils/json_provider.py
+"""
+
+from datetime import timezone
+
+from flask_orjson import OrjsonProvider
+import orjson
+
+# Naive datetimes are UTC, NumPy values returned by the AI engines encode as
+# numbers/arrays, and non-string dict keys are accepted as the stdlib encoder did
+ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps_json(obj):
+    """
+    Serialize obj to JSON bytes with the app-wide orjson configuration
+
+    Args:
+        obj: Data to serialize
+
+    Returns:
+        bytes: UTF-8 encoded JSON
+    """
+    return orjson.dumps(obj, option=ORJSON_OPTIONS, default=OrjsonProvider.default)
+
+
+def utc_isoformat(dt):
+    """
+    Format a naive UTC datetime the way ORJSON_OPTIONS encodes it
+
+    For payloads that bypass orjson (e.g. SocketIO events), so datetimes share
+    one wire format: ISO 8601 with a +00:00 offset.
+
+    Args:
+        dt (datetime): Naive UTC or timezone-aware datetime
+
+    Returns:
+        str: ISO 8601 string with UTC offset
+    """
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.isoformat()
+
+
+class AMEPJSONProvider(OrjsonProvider):
+    """Flask JSON provider using the shared orjson options"""
+    option = ORJSON_OPTIONS
+
+
+__all__ = [
+    'ORJSON_OPTIONS',
+    'dumps_json',
+    'utc_isoformat',
+    'AMEPJSONProvider'
+]
@@ -0,0 +1,91 @@
+"""
+AMEP WebSocket Batcher
+Coalesces high-frequency SocketIO room emits into periodic batch emits
+
+Location: backend/utils/ws_batcher.py
+"""
+
+from collections import deque
+import threading
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Flush interval for queued events (seconds)
+FLUSH_INTERVAL = 0.02
+
+
+class SocketIOBatcher:
+    """
+    Queue SocketIO events per room and emit them in batches
+
+    Events enqueued under the same (event, room) within one flush interval are
+    sent to that room as a single '<event>_batch' event with payload
+    {'events': [...]}, so the request handler returns as soon as the event is
+    queued, and each batch is encoded once for the whole room. The flusher
+    task only runs while there is something queued.
+    """
+
+    def __init__(self, socketio, interval=FLUSH_INTERVAL):
+        self.socketio = socketio
+        self.interval = interval
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    def enqueue(self, event, payload, room):
+        """
+        Queue an event payload for the next batched emit to a room
+
+        Args:
+            event (str): Event name
+            payload (dict): Event payload
+            room (str): Target room
+        """
+        with self._lock:
+            self._queues.setdefault((event, room), deque()).append(payload)
+            if not self._running:
+                self._running = True
+                self.socketio.start_background_task(self._run)
+
+    def _drain(self):
+        """
+        Swap out all queued events, returning {(event, room): [payloads]}
+
+        Marks the flusher as stopped when nothing is queued, so the next
+        enqueue starts a new one.
+        """
+        with self._lock:
+            pending = {key: list(queue) for key, queue in self._queues.items() if queue}
+            self._queues.clear()
+            if not pending:
+                self._running = False
+        return pending
+
+    def _run(self):
+        """Background loop: flush queued events every interval until idle"""
+        while True:
+            self.socketio.sleep(self.interval)
+            pending = self._drain()
+            if not pending:
+                return
+
+            for (event, room), items in pending.items():
+                try:
+                    self.socketio.emit(f"{event}_batch", {'events': items}, to=room)
+                except Exception as e:
+                    logger.error(f"WebSocket batch emit failed | event: {event} | room: {room} | error: {e}")
+
+
+def get_batcher():
+    """Get the SocketIOBatcher registered on the current app"""
+    from flask import current_app
+    return current_app.extensions['ws_batcher']
+
+
+__all__ = [
+    'SocketIOBatcher',
+    'get_batcher',
+    'FLUSH_INTERVAL'
+]